@@ -38,6 +38,12 @@ PLACEMENT_GROUP_OPTIONS = frozenset([
     PLACEMENT_GROUP_SPREAD_IF_SUPPORTED,
     PLACEMENT_GROUP_NONE
 ])
+# Maps each optional style to the style it requests when the cloud and machine
+# type support placement groups.
+PLACEMENT_GROUP_IF_SUPPORTED_STYLES = {
+    PLACEMENT_GROUP_CLUSTER_IF_SUPPORTED: PLACEMENT_GROUP_CLUSTER,
+    PLACEMENT_GROUP_SPREAD_IF_SUPPORTED: PLACEMENT_GROUP_SPREAD,
+}
 
 # Default placement group style is specified by Cloud Specific Placement Group.
 flags.DEFINE_string(
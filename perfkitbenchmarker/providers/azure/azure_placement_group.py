@@ -89,12 +89,12 @@ class AzurePlacementGroup(placement_group.BasePlacementGroup):
     self.resource_group = azure_placement_group_spec.resource_group
     self.name = '%s-%s' % (self.resource_group, self.zone)
     self.region = util.GetRegionFromZone(self.zone)
-    self.strategy = azure_placement_group_spec.placement_group_style
-    if (self.strategy == placement_group.PLACEMENT_GROUP_CLUSTER_IF_SUPPORTED
-       ) or (self.strategy == placement_group.PLACEMENT_GROUP_CLUSTER):
+    self.strategy = placement_group.PLACEMENT_GROUP_IF_SUPPORTED_STYLES.get(
+        azure_placement_group_spec.placement_group_style,
+        azure_placement_group_spec.placement_group_style)
+    if self.strategy == placement_group.PLACEMENT_GROUP_CLUSTER:
       self.strategy = PROXIMITY_PLACEMENT_GROUP
-    if (self.strategy == placement_group.PLACEMENT_GROUP_SPREAD_IF_SUPPORTED
-       ) or (self.strategy == placement_group.PLACEMENT_GROUP_SPREAD):
+    if self.strategy == placement_group.PLACEMENT_GROUP_SPREAD:
       self.strategy = AVAILABILITY_SET
 
   def _Create(self):
@@ -825,9 +825,8 @@ class GceNetwork(network.BaseNetwork):
     no_placement_group = (
         not FLAGS.placement_group_style or
         FLAGS.placement_group_style == placement_group.PLACEMENT_GROUP_NONE)
-    has_optional_pg = FLAGS.placement_group_style in [
-        placement_group.PLACEMENT_GROUP_CLUSTER_IF_SUPPORTED,
-        placement_group.PLACEMENT_GROUP_SPREAD_IF_SUPPORTED]
+    has_optional_pg = (FLAGS.placement_group_style in
+                       placement_group.PLACEMENT_GROUP_IF_SUPPORTED_STYLES)
     if no_placement_group:
       self.placement_group = None
     elif has_optional_pg and not IsPlacementGroupCompatible(
@@ -13,7 +13,8 @@
 # limitations under the License.
 """Class to represent a GCE Windows Virtual Machine object."""
 
-import json
+import base64
+import re
 from typing import Any, Dict, Tuple
 
 from absl import flags
@@ -24,6 +25,7 @@ from perfkitbenchmarker import windows_virtual_machine
 from perfkitbenchmarker.providers.gcp import gce_virtual_machine
 from perfkitbenchmarker.providers.gcp import gcs
 from perfkitbenchmarker.providers.gcp import util
+import six
 
 _WINDOWS_SHUTDOWN_SCRIPT_PS1 = 'Write-Host | gsutil cp - {preempt_marker}'
 
@@ -31,15 +33,48 @@ _METADATA_PREEMPT_CMD_WIN = (f'Invoke-RestMethod -Uri'
                              f' {gce_virtual_machine.METADATA_PREEMPT_URI} '
                              '-Headers @{"Metadata-Flavor"="Google"}')
 
+# Separates the adapter listing from the output of the RSS change in the
+# combined DisableRSS command.
+_RSS_OUTPUT_SEPARATOR = '---SEP---'
+_VIRTIO_ADAPTER = 'Red Hat VirtIO Ethernet Adapter'
+# Lists the network adapters and, only if the VirtIO driver is present,
+# disables RSS in a single WinRM round trip.
+_DISABLE_RSS_CMD = '; '.join([
+    '$adapters = Get-NetAdapter | Out-String -Width 4096',
+    '$adapters',
+    f"Write-Output '{_RSS_OUTPUT_SEPARATOR}'",
+    f"if ($adapters -like '*{_VIRTIO_ADAPTER}*') "
+    '{netsh int tcp set global rss=disabled}',
+])
+# Matches 'netsh int tcp show global' output when RSS is enabled, regardless of
+# the column padding.
+_RSS_ENABLED_RE = re.compile(r'Receive-Side Scaling State\s*:\s*enabled')
+
 FLAGS = flags.FLAGS
 
-BAT_SCRIPT = """
+# Blocks on the service control manager until MSSQLSERVER is running. Encoded
+# since boot metadata is passed to gcloud as a comma-separated list.
+_WAIT_FOR_MSSQLSERVER_PS1 = (
+    "(Get-Service MSSQLSERVER).WaitForStatus('Running', '00:02:00')")
+_WAIT_FOR_MSSQLSERVER_CMD = (
+    'powershell -EncodedCommand {encoded_command}'.format(
+        encoded_command=six.ensure_str(
+            base64.b64encode(_WAIT_FOR_MSSQLSERVER_PS1.encode('utf-16-le')))))
+
+# Waits for MSSQLSERVER to be running, falling back to polling if the wait
+# times out. Must not contain commas; see _WAIT_FOR_MSSQLSERVER_CMD.
+BAT_SCRIPT = f"""
 '
+echo waiting for MSSQLSERVER
+sc start MSSQLSERVER
+{_WAIT_FOR_MSSQLSERVER_CMD}
 :WAIT
+for /f "tokens=4" %%s in ('sc query MSSQLSERVER ^| find "STATE"') do if "%%s"=="RUNNING" goto RUNNING
 echo waiting for MSSQLSERVER
 sc start MSSQLSERVER
 ping 127.0.0.1 -t 1 > NUL
-for /f "tokens=4" %%s in ('sc query MSSQLSERVER ^| find "STATE"') do if NOT "%%s"=="RUNNING" goto WAIT
+goto WAIT
+:RUNNING
 echo MSSQLSERVER is now running!
 sqlcmd.exe -Q "CREATE LOGIN [%COMPUTERNAME%\\perfkit] from windows;"
 sqlcmd.exe -Q "ALTER SERVER ROLE [sysadmin] ADD MEMBER [%COMPUTERNAME%\\perfkit]" '
@@ -68,9 +103,16 @@ class WindowsGceVirtualMachine(gce_virtual_machine.GceVirtualMachine,
       os_types.WINDOWS2022_DESKTOP: 'windows-2022',
   }
 
-  GVNIC_DISABLED_OS_TYPES = [
+  DEFAULT_IMAGE_PROJECT = 'windows-cloud'
+
+  # Startup scripts added to the boot metadata of every VM of this class.
+  BOOT_METADATA = {
+      'windows-startup-script-ps1': windows_virtual_machine.STARTUP_SCRIPT,
+  }
+
+  GVNIC_DISABLED_OS_TYPES = frozenset([
       os_types.WINDOWS2012_CORE, os_types.WINDOWS2012_DESKTOP
-  ]
+  ])
 
   NVME_START_INDEX = 0
   OS_TYPE = os_types.WINDOWS_CORE_OS_TYPES + os_types.WINDOWS_DESKOP_OS_TYPES
@@ -82,8 +124,16 @@ class WindowsGceVirtualMachine(gce_virtual_machine.GceVirtualMachine,
       vm_spec: virtual_machine.BaseVmSpec object of the vm.
     """
     super(WindowsGceVirtualMachine, self).__init__(vm_spec)
-    self.boot_metadata[
-        'windows-startup-script-ps1'] = windows_virtual_machine.STARTUP_SCRIPT
+    self.boot_metadata.update(self.BOOT_METADATA)
+    # Resource metadata is fixed once the VM has been created, so it is
+    # assembled once and reused for every published sample. Cleared in
+    # _AfterReboot so it is rebuilt if the VM is rebooted.
+    self._resource_metadata = None
+    if self.preemptible:
+      # The preempt marker is fixed for the VM's lifetime, so the shutdown
+      # script only needs to be rendered once.
+      self._shutdown_script_ps1 = _WINDOWS_SHUTDOWN_SCRIPT_PS1.format(
+          preempt_marker=self.preempt_marker)
 
   def _GenerateResetPasswordCommand(self):
     """Generates a command to reset a VM user's password.
@@ -95,33 +145,48 @@ class WindowsGceVirtualMachine(gce_virtual_machine.GceVirtualMachine,
     cmd = util.GcloudCommand(self, 'compute', 'reset-windows-password',
                              self.name)
     cmd.flags['user'] = self.user_name
+    # Only the password is needed from the response.
+    cmd.flags['format'] = 'value(password)'
     return cmd
 
   def _PostCreate(self):
-    super(WindowsGceVirtualMachine, self)._PostCreate()
+    # Resetting the password waits on the guest agent, so it runs alongside
+    # the describe calls made by the parent class instead of after them.
+    # Failures in either are raised as errors.VmUtil.ThreadException.
+    vm_util.RunParallelThreads(
+        [(super(WindowsGceVirtualMachine, self)._PostCreate, [], {}),
+         (self._ResetPassword, [], {})], 2)
+
+  def _ResetPassword(self):
+    """Resets the VM user's password and stores the new one."""
     reset_password_cmd = self._GenerateResetPasswordCommand()
     stdout, _ = reset_password_cmd.IssueRetryable()
-    response = json.loads(stdout)
-    self.password = response['password']
+    self.password = stdout.rstrip('\r\n')
 
   def _PreemptibleMetadataKeyValue(self) -> Tuple[str, str]:
     """See base class."""
-    return 'windows-shutdown-script-ps1', _WINDOWS_SHUTDOWN_SCRIPT_PS1.format(
-        preempt_marker=self.preempt_marker)
+    return 'windows-shutdown-script-ps1', self._shutdown_script_ps1
 
+  # num_cpus may be read from the VM the first time metadata is assembled.
   @vm_util.Retry(
       max_retries=10,
-      retryable_exceptions=(GceUnexpectedWindowsAdapterOutputError,
-                            errors.VirtualMachine.RemoteCommandError))
+      retryable_exceptions=(errors.VirtualMachine.RemoteCommandError,))
   def GetResourceMetadata(self) -> Dict[str, Any]:
     """Returns a dict containing metadata about the VM.
 
     Returns:
       dict mapping metadata key to value.
     """
-    result = super(WindowsGceVirtualMachine, self).GetResourceMetadata()
-    result['disable_rss'] = self.disable_rss
-    return result
+    result = self._resource_metadata
+    if result is None:
+      result = super(WindowsGceVirtualMachine, self).GetResourceMetadata()
+      if self.created:
+        self._resource_metadata = result
+    return {**result, 'disable_rss': self.disable_rss}
+
+  def _AfterReboot(self):
+    super(WindowsGceVirtualMachine, self)._AfterReboot()
+    self._resource_metadata = None
 
   def DisableRSS(self):
     """Disables RSS on the GCE VM.
@@ -131,25 +196,36 @@ class WindowsGceVirtualMachine(gce_virtual_machine.GceVirtualMachine,
       GceUnexpectedWindowsAdapterOutputError: If querying the RSS state
         returns unexpected output.
     """
-    # First ensure that the driver supports interrupt moderation
-    net_adapters, _ = self.RemoteCommand('Get-NetAdapter')
-    if 'Red Hat VirtIO Ethernet Adapter' not in net_adapters:
+    # The adapter check and the RSS change are issued together; the change is
+    # only applied on the VM if the driver has been tested with RSS disabled.
+    stdout, _ = self.RemoteCommand(_DISABLE_RSS_CMD)
+    net_adapters, _, _ = stdout.partition(_RSS_OUTPUT_SEPARATOR)
+    if _VIRTIO_ADAPTER not in net_adapters:
       raise GceDriverDoesntSupportFeatureError(
           'Driver not tested with RSS disabled in PKB.')
 
-    command = 'netsh int tcp set global rss=disabled'
-    self.RemoteCommand(command)
     try:
       self.RemoteCommand('Restart-NetAdapter -Name "Ethernet"')
     except IOError:
       # Restarting the network adapter will always fail because
       # the winrm connection used to issue the command will be
-      # broken.
+      # broken, which is why it is not part of the combined command.
       pass
 
-    # Verify the setting went through
+    self._VerifyRSSDisabled()
+
+  @vm_util.Retry(
+      max_retries=10,
+      retryable_exceptions=(GceUnexpectedWindowsAdapterOutputError,
+                            errors.VirtualMachine.RemoteCommandError))
+  def _VerifyRSSDisabled(self):
+    """Verifies that RSS is disabled once the adapter is back up.
+
+    Raises:
+      GceUnexpectedWindowsAdapterOutputError: If RSS is still enabled.
+    """
     stdout, _ = self.RemoteCommand('netsh int tcp show global')
-    if 'Receive-Side Scaling State          : enabled' in stdout:
+    if _RSS_ENABLED_RE.search(stdout):
       raise GceUnexpectedWindowsAdapterOutputError('RSS failed to disable.')
 
   def _AcquireWritePermissionsLinux(self):
@@ -162,9 +238,7 @@ class WindowsGceVirtualMachine(gce_virtual_machine.GceVirtualMachine,
     return self.DEFAULT_IMAGE_FAMILY[self.OS_TYPE]
 
   def GetDefaultImageProject(self) -> str:
-    if self.OS_TYPE in os_types.WINDOWS_SQLSERVER_OS_TYPES:
-      return 'windows-sql-cloud'
-    return 'windows-cloud'
+    return self.DEFAULT_IMAGE_PROJECT
 
   @property
   def _MetadataPreemptCmd(self) -> str:
@@ -182,8 +256,11 @@ class WindowsGceSqlServerVirtualMachine(WindowsGceVirtualMachine):
       os_types.WINDOWS2022_SQLSERVER_2019_ENTERPRISE: 'sql-ent-2019-win-2022',
   }
 
-  OS_TYPE = os_types.WINDOWS_SQLSERVER_OS_TYPES
+  DEFAULT_IMAGE_PROJECT = 'windows-sql-cloud'
 
-  def __init__(self, vm_spec):
-    super().__init__(vm_spec)
-    self.boot_metadata['windows-startup-script-bat'] = BAT_SCRIPT
+  BOOT_METADATA = {
+      **WindowsGceVirtualMachine.BOOT_METADATA,
+      'windows-startup-script-bat': BAT_SCRIPT,
+  }
+
+  OS_TYPE = os_types.WINDOWS_SQLSERVER_OS_TYPES
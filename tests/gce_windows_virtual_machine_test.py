@@ -18,12 +18,13 @@ import unittest
 from absl import flags
 from absl.testing import parameterized
 import mock
+from perfkitbenchmarker import errors
 from perfkitbenchmarker import os_types
 from perfkitbenchmarker import providers
 from perfkitbenchmarker import virtual_machine
 from perfkitbenchmarker import vm_util
 from perfkitbenchmarker.providers.gcp import gce_virtual_machine
-from perfkitbenchmarker.providers.gcp import gce_windows_virtual_machine  # pylint:disable=unused-import
+from perfkitbenchmarker.providers.gcp import gce_windows_virtual_machine
 from tests import pkb_common_test_case
 
 FLAGS = flags.FLAGS
@@ -49,6 +50,10 @@ class GceWindowsVirtualMachineTestCase(pkb_common_test_case.PkbCommonTestCase):
     get_tmp_dir_mock.start()
     self.addCleanup(get_tmp_dir_mock.stop)
 
+  def _CreateVm(self, os_type=os_types.WINDOWS2022_DESKTOP):
+    vm_class = virtual_machine.GetVmClass(providers.GCP, os_type)
+    return vm_class(self.spec)
+
   @parameterized.named_parameters(
       ('WINDOWS2022_DESKTOP', os_types.WINDOWS2022_DESKTOP, True,
        'windows-2022', 'windows-cloud'),
@@ -58,12 +63,114 @@ class GceWindowsVirtualMachineTestCase(pkb_common_test_case.PkbCommonTestCase):
        os_types.WINDOWS2022_SQLSERVER_2019_ENTERPRISE, True,
        'sql-ent-2019-win-2022', 'windows-sql-cloud'))
   def testWindowsConfig(self, os_type, gvnic, family, project):
-    vm_class = virtual_machine.GetVmClass(providers.GCP, os_type)
-    vm = vm_class(self.spec)
+    vm = self._CreateVm(os_type)
     self.assertEqual(vm.OS_TYPE, os_type)
     self.assertEqual(vm.SupportGVNIC(), gvnic)
     self.assertEqual(vm.GetDefaultImageFamily(), family)
     self.assertEqual(vm.GetDefaultImageProject(), project)
+    self.assertIn('windows-startup-script-ps1', vm.boot_metadata)
+    self.assertEqual('windows-startup-script-bat' in vm.boot_metadata,
+                     project == 'windows-sql-cloud')
+
+  def testSqlServerStartupScriptIsOneMetadataEntry(self):
+    vm = self._CreateVm(os_types.WINDOWS2022_SQLSERVER_2019_ENTERPRISE)
+    gcloud_cmd = vm._GenerateCreateCommand('x')
+    # gcloud splits the --metadata value on commas.
+    metadata_entries = gcloud_cmd.flags['metadata'].split(',')
+    self.assertIn(
+        'windows-startup-script-bat=' + gce_windows_virtual_machine.BAT_SCRIPT,
+        metadata_entries)
+
+  def testDisableRSS(self):
+    vm = self._CreateVm()
+    adapters = '\n'.join([
+        'Ethernet  Red Hat VirtIO Ethernet Adapter  Up',
+        gce_windows_virtual_machine._RSS_OUTPUT_SEPARATOR, 'Ok.'
+    ])
+    rss_state = 'Receive-Side Scaling State          : disabled'
+    with mock.patch.object(vm, 'RemoteCommand') as remote_command:
+      remote_command.side_effect = [(adapters, ''), IOError(),
+                                    (rss_state, '')]
+      vm.DisableRSS()
+    self.assertEqual(remote_command.call_count, 3)
+    self.assertIn('rss=disabled', remote_command.call_args_list[0][0][0])
+
+  @parameterized.named_parameters(
+      ('Enabled', 'Receive-Side Scaling State          : enabled', True),
+      ('EnabledNarrowPadding', 'Receive-Side Scaling State : enabled', True),
+      ('Disabled', 'Receive-Side Scaling State          : disabled', False))
+  def testRSSEnabledRegex(self, netsh_output, enabled):
+    self.assertEqual(
+        bool(gce_windows_virtual_machine._RSS_ENABLED_RE.search(netsh_output)),
+        enabled)
+
+  def testDisableRSSUnsupportedDriver(self):
+    vm = self._CreateVm()
+    with mock.patch.object(vm, 'RemoteCommand') as remote_command:
+      remote_command.return_value = (
+          'Ethernet  gVNIC  Up\n' +
+          gce_windows_virtual_machine._RSS_OUTPUT_SEPARATOR, '')
+      with self.assertRaises(
+          gce_windows_virtual_machine.GceDriverDoesntSupportFeatureError):
+        vm.DisableRSS()
+    remote_command.assert_called_once()
+
+  def testGetResourceMetadataIsCached(self):
+    vm = self._CreateVm()
+    vm.created = True
+    with mock.patch.object(
+        gce_virtual_machine.GceVirtualMachine, 'GetResourceMetadata',
+        return_value={'zone': 'us-central1-a'}) as get_metadata:
+      vm.GetResourceMetadata()
+      metadata = vm.GetResourceMetadata()
+    get_metadata.assert_called_once()
+    self.assertEqual(metadata, {'zone': 'us-central1-a', 'disable_rss': False})
+
+  def testGetResourceMetadataRebuiltAfterReboot(self):
+    vm = self._CreateVm()
+    vm.created = True
+    with mock.patch.object(
+        gce_virtual_machine.GceVirtualMachine, 'GetResourceMetadata',
+        return_value={}) as get_metadata:
+      vm.GetResourceMetadata()
+      vm._AfterReboot()
+      vm.GetResourceMetadata()
+    self.assertEqual(get_metadata.call_count, 2)
+
+  def testGetResourceMetadataBeforeCreate(self):
+    vm = self._CreateVm()
+    self.assertFalse(vm.GetResourceMetadata()['disable_rss'])
+    self.assertIsNone(vm._resource_metadata)
+
+  def testResetPassword(self):
+    vm = self._CreateVm()
+    with mock.patch.object(
+        gce_windows_virtual_machine.util.GcloudCommand, 'IssueRetryable',
+        return_value=('p@ss"word\n', '')):
+      vm._ResetPassword()
+    self.assertEqual(vm.password, 'p@ss"word')
+    self.assertEqual(
+        vm._GenerateResetPasswordCommand().flags['format'], 'value(password)')
+
+  def testPostCreateResetsPassword(self):
+    vm = self._CreateVm()
+    with mock.patch.object(gce_virtual_machine.GceVirtualMachine,
+                           '_PostCreate') as parent_post_create, \
+        mock.patch.object(vm, '_ResetPassword') as reset_password:
+      vm._PostCreate()
+    parent_post_create.assert_called_once()
+    reset_password.assert_called_once()
+
+  def testPostCreateFailsWhenResetPasswordFails(self):
+    vm = self._CreateVm()
+    with mock.patch.object(gce_virtual_machine.GceVirtualMachine,
+                           '_PostCreate'), \
+        mock.patch.object(
+            vm, '_ResetPassword',
+            side_effect=errors.VmUtil.IssueCommandError('reset failed')):
+      with self.assertRaisesRegex(errors.VmUtil.ThreadException,
+                                  'reset failed'):
+        vm._PostCreate()
 
 
 if __name__ == '__main__':